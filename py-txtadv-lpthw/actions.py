@@ -59,6 +59,14 @@ def __init__(self):
                          hotkey='i')
 
 
+class ViewMap(Action):
+    """Prints the explored part of the map around the player"""
+    def __init__(self):
+        super().__init__(method=Player.print_map,
+                         name='View map',
+                         hotkey='m')
+
+
 class Attack(Action):
     def __init__(self, enemy):
         super().__init__(method=Player.attack,
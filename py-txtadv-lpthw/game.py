@@ -1,35 +1,49 @@
 """A simple text adventure from a beginners template."""
 
+import os
+import sys
+
 from player import Player
 from items import Weapon
+import telemetry
 import world
 
 
-def play():
+def play(telemetry_path=None):
     world.load_tiles()
     start_items = Weapon("Rock", "A fist-sized stone.", 0, 5)
     player = Player(start_items)
-    room = world.tile_exists(player.location_x, player.location_y)
-    print(room.intro_text())
-    while player.is_alive() and not player.victory:
+    if telemetry_path:
+        player.telemetry = telemetry.TelemetryWriter(telemetry_path)
+    try:
         room = world.tile_exists(player.location_x, player.location_y)
-        room.modify_player(player)
-        # Check again since the room could have changed the player's state
-        if player.is_alive() and not player.victory:
-            print("\nYou must choose!\n")
-            available_actions = room.available_actions()
-            for action in available_actions:
-                print(action)
-            valid_choice = False
-            action_input = input('Action: ')
-            for action in available_actions:
-                if action_input == action.hotkey:
-                    valid_choice = True
-                    player.do_action(action, **action.kwargs)
-                    break
-            if not valid_choice:
-                print(f"\n{action_input} is not a valid action! Try Again.")
+        print(room.intro_text())
+        while player.is_alive() and not player.victory:
+            room = world.tile_exists(player.location_x, player.location_y)
+            room.modify_player(player)
+            # Check again since the room could have changed the player's state
+            if player.is_alive() and not player.victory:
+                print("\nYou must choose!\n")
+                available_actions = room.available_actions()
+                for action in available_actions:
+                    print(action)
+                valid_choice = False
+                action_input = input('Action: ')
+                for action in available_actions:
+                    if action_input == action.hotkey:
+                        valid_choice = True
+                        player.do_action(action, **action.kwargs)
+                        break
+                if not valid_choice:
+                    print(f"\n{action_input} is not a valid action! "
+                          "Try Again.")
+        player.record(telemetry.VICTORY if player.victory else telemetry.DEATH)
+    finally:
+        player.close()
 
 
 if __name__ == "__main__":
-    play()
+    # Record telemetry to the path given as the first argument, or to
+    # $TXTADV_TELEMETRY if that is set
+    play(sys.argv[1] if len(sys.argv) > 1
+         else os.environ.get('TXTADV_TELEMETRY'))
@@ -1,6 +1,7 @@
 """Items and Inventory for 'holding'/tracking Items"""
 
 from collections import defaultdict
+import threading
 
 
 class Item(object):
@@ -77,6 +78,8 @@ class Inventory(object):
     Manages Items as a defaultdict(list, Class: object).
     Defaults to 5 slots total space
     Optionally, pass in items during construction
+    Every change holds the Inventory's lock, so one can be shared
+    between threads; use transfer() to move Items between two.
 
     """
 
@@ -86,6 +89,7 @@ def __init__(self, slots=5, *initial_items):
         self.used = 0
         self._currency = 0
         self._contents = defaultdict(list)
+        self._lock = threading.RLock()
         for item in initial_items:
             self.store(item)
 
@@ -113,18 +117,38 @@ def __eq__(self, other):
     def __len__(self):
         return self.used
 
+    @property
+    def gold(self):
+        return self._currency
+
     def contents(self, *types):
         """Return Items of specific type/s or a complete list."""
-        if types:
-            return [item
-                    for item_type in types
-                    for item in self._contents[item_type.capitalize()]
-                    ]
-        else:
-            return [item
-                    for items in self._contents.values()
-                    for item in items
-                    ]
+        with self._lock:
+            if types:
+                return [item
+                        for item_type in types
+                        for item in self._contents[item_type.capitalize()]
+                        ]
+            else:
+                return [item
+                        for items in self._contents.values()
+                        for item in items
+                        ]
+
+    def holds(self, *items):
+        """Return True if every Item, and all the Gold, is in Inventory."""
+        with self._lock:
+            wanted = defaultdict(int)
+            gold = 0
+            for item in items:
+                if isinstance(item, Gold):
+                    gold += item.value
+                else:
+                    wanted[item] += 1
+            return gold <= self._currency and all(
+                self._contents[item.__class__.__name__].count(item) >= needed
+                for item, needed in wanted.items()
+                )
 
     def is_full(self):
         """Return True if Inventory is full."""
@@ -135,37 +159,136 @@ def expand(self, amount_to_expand=1):
         :param amount_to_expand int: default 1
 
         """
-        self.capacity += amount_to_expand
-        self.free += amount_to_expand
+        with self._lock:
+            self.capacity += amount_to_expand
+            self.free += amount_to_expand
 
     def shrink(self, amount_to_shrink=1):
         """Reduce total space an Inventory can hold."""
         # TODO: what if they now have too many items?
-        self.capacity -= amount_to_shrink
-        self.free -= amount_to_shrink
+        with self._lock:
+            self.capacity -= amount_to_shrink
+            self.free -= amount_to_shrink
 
     def store(self, *items):
-        """Accept any amount of Items to Inventory."""
-        # TODO: Better error handling for full inventory
-        for item in items:
-            item_type = item.__class__.__name__
-            if item_type == 'Gold':
-                self._currency += item.value
-            elif not self.is_full():
-                self._contents[item_type].append(item)
-                self.used += 1
-                self.free -= 1
-            else:
-                print(f"Inventory full. {item.name} not stored.")
+        """Accept any amount of Items to Inventory.
+
+        Return a list of the Items that did not fit.
+
+        """
+        rejected = []
+        with self._lock:
+            for item in items:
+                if isinstance(item, Gold) or not self.is_full():
+                    self._add(item)
+                else:
+                    rejected.append(item)
+                    print(f"Inventory full. {item.name} not stored.")
+        return rejected
 
     def drop(self, *items):
-        """Remove any amount of Items from inventory."""
-        for item in items:
-            item_type = item.__class__.__name__
-            if item in self.contents(item_type):
-                self._contents[item_type].remove(item)
-                self.used -= 1
-                self.free += 1
+        """Remove any amount of Items from inventory.
+
+        Return a list of the Items that were not in the Inventory.
+
+        """
+        missing = []
+        with self._lock:
+            for item in items:
+                item_type = item.__class__.__name__
+                if item_type != 'Gold' and item in self._contents[item_type]:
+                    self._remove(item)
+                else:
+                    missing.append(item)
+        return missing
+
+    def _add(self, item):
+        """Store an Item without checking for space. Caller holds the lock."""
+        item_type = item.__class__.__name__
+        if item_type == 'Gold':
+            self._currency += item.value
+        else:
+            self._contents[item_type].append(item)
+            self.used += 1
+            self.free -= 1
+
+    def _remove(self, item):
+        """Take out an Item known to be held. Caller holds the lock."""
+        item_type = item.__class__.__name__
+        if item_type == 'Gold':
+            self._currency -= item.value
+        else:
+            self._contents[item_type].remove(item)
+            self.used -= 1
+            self.free += 1
+
+
+def transfer(source, destination, *items):
+    """Move Items (Gold included) from one Inventory to another.
+
+    Nothing moves unless everything can: return a list of the Items
+    that blocked the transfer, or an empty list once it is done.
+
+    """
+    return transfer_batch([(source, destination, items)])
+
+
+def transfer_batch(transfers):
+    """Run several (source, destination, items) transfers as one.
+
+    Every Inventory involved is locked, always in the same order so two
+    batches can never deadlock, and the whole batch is checked before
+    anything moves. Return a list of the Items that blocked it, or an
+    empty list once every transfer is done.
+
+    """
+    transfers = [(source, destination, list(items))
+                 for source, destination, items in transfers]
+    inventories = {}
+    for source, destination, _ in transfers:
+        inventories[id(source)] = source
+        inventories[id(destination)] = destination
+    locks = [inventories[key]._lock for key in sorted(inventories)]
+    for lock in locks:
+        lock.acquire()
+    try:
+        held = {}
+        gold = {key: inventory.gold for key, inventory in inventories.items()}
+        used = {key: inventory.used for key, inventory in inventories.items()}
+        rejected = []
+        for source, destination, items in transfers:
+            src, dst = id(source), id(destination)
+            for item in items:
+                if isinstance(item, Gold):
+                    if not 0 <= item.value <= gold[src]:
+                        rejected.append(item)
+                        continue
+                    gold[src] -= item.value
+                    gold[dst] += item.value
+                    continue
+                for key, inventory in ((src, source), (dst, destination)):
+                    if (key, item) not in held:
+                        held[(key, item)] = inventory._contents[
+                            item.__class__.__name__].count(item)
+                if held[(src, item)] < 1:
+                    rejected.append(item)
+                elif src != dst and used[dst] >= destination.capacity:
+                    rejected.append(item)
+                else:
+                    held[(src, item)] -= 1
+                    held[(dst, item)] += 1
+                    used[src] -= 1
+                    used[dst] += 1
+        if rejected:
+            return rejected
+        for source, destination, items in transfers:
+            for item in items:
+                source._remove(item)
+                destination._add(item)
+        return []
+    finally:
+        for lock in reversed(locks):
+            lock.release()
 
 
 class Weapon(Item):
@@ -0,0 +1,120 @@
+"""Tracks explored tiles and draws them as a small ASCII map"""
+
+import world
+
+
+class ExploredTiles(object):
+
+    """
+    One byte per tile of the world, set once a player has been there.
+    Coordinates outside the map are never explored.
+
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._bits = bytearray(width * height)
+
+    def __contains__(self, location):
+        x, y = location
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self._bits[y * self.width + x])
+        return False
+
+    def mark(self, x, y):
+        """Explore a tile. Return True if it had not been explored."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        index = y * self.width + x
+        if self._bits[index]:
+            return False
+        self._bits[index] = 1
+        return True
+
+
+class Minimap(object):
+
+    """
+    A cached text framebuffer of the tiles around a player.
+
+    The viewport scrolls to re-centre on the player once they come
+    within a tile of its edge, and never past the edge of the map, so a
+    map that fits is always drawn whole. Each cell remembers whether it
+    held the player, whether its tile was explored and the tile's
+    world.tile_version() when it was drawn; a render redraws only the
+    cells where one of those has since changed, so the cost of a turn
+    depends on the viewport and not the size of the map.
+
+    """
+
+    def __init__(self, player, width=None, height=None):
+        """
+        :param player: the Player whose explored tiles are drawn
+        :param int width: viewport columns, 9 or the map width if smaller
+        :param int height: viewport rows, 9 or the map height if smaller
+        """
+        map_width, map_height = player.explored.width, player.explored.height
+        if width is None:
+            width = min(9, map_width) or 9
+        if height is None:
+            height = min(9, map_height) or 9
+        self.player = player
+        self.width = width
+        self.height = height
+        self.origin = None
+        self._drawn = None
+        self._cells = [[' '] * width for _ in range(height)]
+        self._rows = [' ' * width] * height
+
+    @staticmethod
+    def _scroll(start, position, size, limit):
+        """Return where a viewport axis should start to show position."""
+        margin = 1 if size > 2 else 0
+        if start is None or not (start + margin <= position
+                                 < start + size - margin):
+            start = position - size // 2
+        return max(0, min(start, limit - size))
+
+    def _moved_origin(self, x, y):
+        if self.origin is None:
+            start_x = start_y = None
+        else:
+            start_x, start_y = self.origin
+        explored = self.player.explored
+        return (self._scroll(start_x, x, self.width, explored.width),
+                self._scroll(start_y, y, self.height, explored.height))
+
+    def symbol(self, x, y):
+        """Return the character drawn for the tile at (x, y)."""
+        if (x, y) == (self.player.location_x, self.player.location_y):
+            return '@'
+        if (x, y) not in self.player.explored:
+            return ' '
+        tile = world.tile_exists(x, y)
+        return tile.symbol() if tile else ' '
+
+    def render(self):
+        """Redraw the changed cells and return the whole viewport as text."""
+        here = (self.player.location_x, self.player.location_y)
+        origin = self._moved_origin(*here)
+        if origin != self.origin:
+            self.origin = origin
+            self._drawn = [[None] * self.width for _ in range(self.height)]
+        ox, oy = self.origin
+        explored = self.player.explored
+        for row in range(self.height):
+            y = oy + row
+            cells, drawn = self._cells[row], self._drawn[row]
+            changed = False
+            for column in range(self.width):
+                x = ox + column
+                state = ((x, y) == here, (x, y) in explored,
+                         world.tile_version(x, y))
+                if drawn[column] != state:
+                    drawn[column] = state
+                    cells[column] = self.symbol(x, y)
+                    changed = True
+            if changed:
+                self._rows[row] = ''.join(cells)
+        return '\n'.join(self._rows)
@@ -3,6 +3,8 @@
 import random
 
 from items import Inventory
+from minimap import ExploredTiles, Minimap
+import telemetry
 import world
 
 
@@ -13,6 +15,10 @@ def __init__(self, *initial_items):
         self.victory = False
         self.location_x, self.location_y = world.starting_position
         self.inventory = Inventory(slots=4)
+        self.telemetry = None
+        self.explored = ExploredTiles(*world.map_size)
+        self.explored.mark(self.location_x, self.location_y)
+        self.minimap = Minimap(self)
         if initial_items:
             for item in initial_items:
                 self.inventory.store(item)
@@ -20,9 +26,22 @@ def __init__(self, *initial_items):
     def is_alive(self):
         return self.health > 0
 
+    def close(self):
+        """Release what the player holds open, such as its telemetry."""
+        if self.telemetry is not None:
+            self.telemetry.close()
+
+    def record(self, kind, value=0):
+        """Log a gameplay event at the current location, if tracked."""
+        if self.telemetry is not None:
+            self.telemetry.record(kind, self.location_x, self.location_y, value)
+
     def print_inventory(self):
         print(self.inventory, '\n')
 
+    def print_map(self):
+        print(self.minimap.render(), '\n')
+
     def do_action(self, action, **kwargs):
         action_method = getattr(self, action.method.__name__)
         if action_method:
@@ -31,6 +50,8 @@ def do_action(self, action, **kwargs):
     def move(self, dx, dy):
         self.location_x += dx
         self.location_y += dy
+        self.explored.mark(self.location_x, self.location_y)
+        self.record(telemetry.MOVE)
         print(world.tile_exists(self.location_x, self.location_y).intro_text())
 
     def move_north(self):
@@ -55,13 +76,16 @@ def attack(self, enemy):
 
         print(f"\t\tYou attack {enemy.name} with the {best_weapon.name}!")
         enemy.health -= best_weapon.damage
+        self.record(telemetry.ATTACK, best_weapon.damage)
         if not enemy.is_alive():
             print(f"\t\tYou killed {enemy.name}!")
+            world.tile_changed(self.location_x, self.location_y)
         else:
             print(f"\t\t{enemy.name} has {enemy.health} health.")
 
     def flee(self, tile):
         """Moves the player randomly to an adjacent tile"""
+        self.record(telemetry.FLEE)
         available_moves = tile.adjacent_moves()
         r = random.randint(0, len(available_moves) - 1)
         self.do_action(available_moves[r])
@@ -0,0 +1,331 @@
+"""Runs many game sessions in fixed ticks instead of one input() loop each"""
+
+from collections import deque
+import io
+import logging
+import sys
+import time
+
+import actions
+from player import Player
+import telemetry
+import world
+
+log = logging.getLogger(__name__)
+
+MOVE_METHODS = frozenset(
+    ['move_north', 'move_south', 'move_east', 'move_west']
+    )
+
+
+class Session(object):
+
+    """One player's game, fed commands and drained of output by a scheduler."""
+
+    def __init__(self, player, write, max_pending=8):
+        """
+        :param player: the Player this session controls
+        :param write: called with the session's text once per tick
+        :param int max_pending: commands queued before submit() refuses
+        """
+        self.player = player
+        self.write = write
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.output = io.StringIO()
+        self.finished = False
+
+    def submit(self, command):
+        """Queue a hotkey for the next tick. Return False if refused."""
+        if self.finished or len(self.pending) >= self.max_pending:
+            return False
+        self.pending.append(command)
+        return True
+
+    def flush(self):
+        """Hand everything printed since the last flush to write()."""
+        text = self.output.getvalue()
+        if text:
+            self.output.seek(0)
+            self.output.truncate()
+            self.write(text)
+
+
+class TickScheduler(object):
+
+    """
+    Collects one command from each waiting session per tick and runs
+    them grouped by kind: every move, then every attack (per enemy, so
+    a kill is seen by the rest of the group), then everything else.
+    Each session's output is written once at the end of the tick.
+
+    The actions and menu of a tile are built once and reused until the
+    tile reports a change, instead of being rebuilt for every command.
+
+    """
+
+    def __init__(self, tick_rate=10, max_commands_per_tick=1024,
+                 clock=time.perf_counter, sleep=time.sleep,
+                 telemetry_path=None):
+        """
+        :param tick_rate: ticks per second run() aims for
+        :param int max_commands_per_tick: most sessions served in a tick
+        :param clock: returns the current time in seconds
+        :param sleep: waits for a number of seconds
+        :param str telemetry_path: if given, every joining player without
+            a writer of its own records its events there
+        """
+        self.tick_rate = tick_rate
+        self.max_commands_per_tick = max_commands_per_tick
+        self.budget = max_commands_per_tick
+        self.overruns = 0
+        self.clock = clock
+        self.sleep = sleep
+        self.sessions = deque()
+        self._rooms = {}
+        self.telemetry = None
+        if telemetry_path:
+            self.telemetry = telemetry.TelemetryWriter(telemetry_path)
+
+    def close(self):
+        """Write out and close the shared telemetry, if any."""
+        if self.telemetry is not None:
+            self.telemetry.close()
+
+    def _room(self, x, y):
+        """Return the (actions by hotkey, menu text) of a tile."""
+        version = world.tile_version(x, y)
+        room = self._rooms.get((x, y))
+        if room is None or room[0] != version:
+            available_actions = world.tile_exists(x, y).available_actions()
+            room = self._rooms[(x, y)] = (
+                version,
+                {action.hotkey: action for action in available_actions},
+                ''.join(['\nYou must choose!\n\n'] +
+                        [f'{action}\n' for action in available_actions])
+                )
+        return room[1:]
+
+    def _guard(self, session, method, *args, **kwargs):
+        """Run one step of a session, keeping its errors to that session.
+
+        Return False if the step raised.
+
+        """
+        try:
+            method(*args, **kwargs)
+        except Exception as error:
+            log.exception("Session step %s failed", method.__name__)
+            print(f"\nSomething went wrong: {error!r}")
+            return False
+        return True
+
+    def _flush(self, session):
+        """Write a session's output, ending the session if that fails.
+
+        Return False if the session's write() raised.
+
+        """
+        try:
+            session.flush()
+        except Exception:
+            log.exception("Writing to a session failed; dropping it")
+            self._end(session)
+            return False
+        return True
+
+    def join(self, session):
+        """Start a session and write its opening text."""
+        player = session.player
+        if self.telemetry is not None and player.telemetry is None:
+            player.telemetry = telemetry.SessionRecorder(self.telemetry)
+        stdout = sys.stdout
+        sys.stdout = session.output
+        try:
+            print(world.tile_exists(player.location_x,
+                                    player.location_y).intro_text())
+            if not self._guard(session, self._start_turn, session):
+                self._end(session)
+        finally:
+            sys.stdout = stdout
+        if self._flush(session) and not session.finished:
+            self.sessions.append(session)
+
+    def leave(self, session):
+        """Drop a session, write what it has left and close its player."""
+        session.pending.clear()
+        if session in self.sessions:
+            self.sessions.remove(session)
+        self._end(session)
+        self._flush(session)
+
+    def _end(self, session):
+        session.finished = True
+        session.player.close()
+
+    def _start_turn(self, session):
+        """Let the room act on the player, then prompt or end the game."""
+        player = session.player
+        world.tile_exists(player.location_x,
+                          player.location_y).modify_player(player)
+        if player.is_alive() and not player.victory:
+            print(self._room(player.location_x, player.location_y)[1])
+        else:
+            player.record(telemetry.VICTORY if player.victory
+                          else telemetry.DEATH)
+            self._end(session)
+
+    def _take_batch(self):
+        """Pop one command from up to budget sessions, round robin."""
+        batch = []
+        for _ in range(len(self.sessions)):
+            if len(batch) >= self.budget:
+                break
+            session = self.sessions[0]
+            self.sessions.rotate(-1)
+            if session.pending:
+                batch.append((session, session.pending.popleft()))
+        return batch
+
+    def tick(self):
+        """Run one tick. Return the number of commands handled."""
+        batch = self._take_batch()
+        if not batch:
+            return 0
+        moves, attacks, others = [], {}, []
+        for session, command in batch:
+            player = session.player
+            action = self._room(player.location_x,
+                                player.location_y)[0].get(command)
+            if action is None:
+                session.output.write(
+                    f"\n{command} is not a valid action! Try Again.\n")
+                others.append((session, None))
+            elif action.method.__name__ in MOVE_METHODS:
+                moves.append((session, action))
+            elif isinstance(action, actions.Attack):
+                enemy = action.kwargs['enemy']
+                attacks.setdefault(id(enemy), []).append((session, action))
+            else:
+                others.append((session, action))
+
+        stdout = sys.stdout
+        try:
+            for session, action in moves:
+                sys.stdout = session.output
+                self._guard(session, session.player.do_action, action)
+            for group in attacks.values():
+                for session, action in group:
+                    sys.stdout = session.output
+                    enemy = action.kwargs['enemy']
+                    if enemy.is_alive():
+                        self._guard(session, session.player.do_action,
+                                    action, **action.kwargs)
+                    else:
+                        print(f"\t\t{enemy.name} is already dead.")
+            for session, action in others:
+                sys.stdout = session.output
+                if action is not None:
+                    self._guard(session, session.player.do_action,
+                                action, **action.kwargs)
+            for session, _ in batch:
+                sys.stdout = session.output
+                if not self._guard(session, self._start_turn, session):
+                    self._end(session)
+        finally:
+            sys.stdout = stdout
+
+        for session, _ in batch:
+            self._flush(session)
+        if any(session.finished for session, _ in batch):
+            self.sessions = deque(session for session in self.sessions
+                                  if not session.finished)
+        return len(batch)
+
+    def run(self, ticks=None):
+        """
+        Tick at tick_rate until no sessions remain, or for a number of
+        ticks. A tick that runs past its slot halves the budget of
+        commands taken per tick; each tick that fits doubles it back
+        towards max_commands_per_tick. Return the commands handled.
+
+        """
+        interval = 1 / self.tick_rate
+        handled = 0
+        while self.sessions and (ticks is None or ticks > 0):
+            started = self.clock()
+            handled += self.tick()
+            elapsed = self.clock() - started
+            if elapsed > interval:
+                self.overruns += 1
+                self.budget = max(1, self.budget // 2)
+            else:
+                self.budget = min(self.max_commands_per_tick, self.budget * 2)
+                self.sleep(interval - elapsed)
+            if ticks is not None:
+                ticks -= 1
+        return handled
+
+
+if __name__ == '__main__':
+    def main():
+        import random
+        from items import Weapon
+
+        sessions_count, rounds = 2000, 20
+        world.load_tiles()
+
+        def new_player():
+            return Player(Weapon("Rock", "A fist-sized stone.", 0, 5))
+
+        def commands():
+            rng = random.Random(1)
+            return [[rng.choice('nsewiaf') for _ in range(sessions_count)]
+                    for _ in range(rounds)]
+
+        print("### one command at a time, as game.play() does")
+        stdout = sys.stdout
+        players = [new_player() for _ in range(sessions_count)]
+        started = time.perf_counter()
+        handled = 0
+        for round_commands in commands():
+            for player, command in zip(players, round_commands):
+                if not (player.is_alive() and not player.victory):
+                    continue
+                sys.stdout = io.StringIO()
+                room = world.tile_exists(player.location_x, player.location_y)
+                room.modify_player(player)
+                print("\nYou must choose!\n")
+                available_actions = room.available_actions()
+                for action in available_actions:
+                    print(action)
+                valid_choice = False
+                for action in available_actions:
+                    if command == action.hotkey:
+                        valid_choice = True
+                        player.do_action(action, **action.kwargs)
+                        break
+                if not valid_choice:
+                    print(f"\n{command} is not a valid action! Try Again.")
+                sys.stdout = stdout
+                handled += 1
+        elapsed = time.perf_counter() - started
+        print(f"{handled} commands, {handled / elapsed:,.0f} commands/sec")
+
+        print("### tick scheduler")
+        world.load_tiles()
+        scheduler = TickScheduler(max_commands_per_tick=sessions_count)
+        sessions = [Session(new_player(), lambda text: None)
+                    for _ in range(sessions_count)]
+        for session in sessions:
+            scheduler.join(session)
+        started = time.perf_counter()
+        handled = 0
+        for round_commands in commands():
+            for session, command in zip(sessions, round_commands):
+                session.submit(command)
+            handled += scheduler.tick()
+        elapsed = time.perf_counter() - started
+        print(f"{handled} commands, {handled / elapsed:,.0f} commands/sec")
+
+    main()
@@ -0,0 +1,178 @@
+"""A stash and trading post shared by every player on a server"""
+
+from itertools import count
+import threading
+
+from items import Gold, Inventory, transfer, transfer_batch
+
+
+class Stash(object):
+
+    """
+    A shared Inventory players deposit Items into and withdraw from.
+
+    Each call only locks the stash and the one player Inventory it
+    touches, so players trading among themselves never wait on it.
+
+    """
+
+    def __init__(self, slots=100):
+        self.inventory = Inventory(slots)
+
+    def deposit(self, inventory, *items):
+        """Move Items into the stash. Return the Items that blocked it."""
+        return transfer(inventory, self.inventory, *items)
+
+    def withdraw(self, inventory, *items):
+        """Move Items out of the stash. Return the Items that blocked it."""
+        return transfer(self.inventory, inventory, *items)
+
+
+class TradingPost(object):
+
+    """
+    Players post offers of Items for a price in Gold; another player
+    accepting one swaps the Items and the Gold in a single transfer.
+
+    Offered Items stay with the seller until the trade, so an offer
+    whose Items have since gone elsewhere is refused and taken down.
+    Each offer has its own lock, held for the whole of an accept() or
+    cancel(), so the two never interleave and the offer stays listed
+    until one of them settles it.
+
+    """
+
+    def __init__(self):
+        self._offers = {}
+        self._offers_lock = threading.Lock()
+        self._ids = count(1)
+
+    def offers(self):
+        """Return {offer id: (seller, items, price)} for open offers."""
+        with self._offers_lock:
+            return {offer_id: offer[:3]
+                    for offer_id, offer in self._offers.items()}
+
+    def offer(self, seller, items, price):
+        """Post Items from the seller's Inventory.
+
+        Return the offer id, or None if the price is negative or the
+        seller does not hold the Items.
+
+        """
+        items = tuple(items)
+        if price < 0:
+            return None
+        with seller._lock:
+            if not seller.holds(*items):
+                return None
+            with self._offers_lock:
+                offer_id = next(self._ids)
+                self._offers[offer_id] = (seller, items, price,
+                                          threading.Lock())
+        return offer_id
+
+    def _open(self, offer_id):
+        with self._offers_lock:
+            return self._offers.get(offer_id)
+
+    def _close(self, offer_id):
+        with self._offers_lock:
+            del self._offers[offer_id]
+
+    def cancel(self, offer_id, seller):
+        """Take down one of the seller's offers.
+
+        Return False if it was not open or belongs to someone else.
+
+        """
+        offer = self._open(offer_id)
+        if offer is None or offer[0] is not seller:
+            return False
+        with offer[3]:
+            if self._open(offer_id) is not offer:
+                return False
+            self._close(offer_id)
+        return True
+
+    def accept(self, offer_id, buyer):
+        """Buy an offer with the buyer's Inventory.
+
+        Return the Items that blocked the trade (Gold if the buyer is
+        short), an empty list once the trade is done, or None if the
+        offer is not open. A trade that fails for lack of space or Gold
+        leaves the offer open; one the seller can no longer fill does not.
+
+        """
+        offer = self._open(offer_id)
+        if offer is None:
+            return None
+        seller, items, price, lock = offer
+        with lock:
+            if self._open(offer_id) is not offer:
+                return None
+            rejected = transfer_batch([
+                (seller, buyer, items),
+                (buyer, seller, [Gold(price)]),
+                ])
+            still_held = seller.contents()
+            if not rejected or not all(isinstance(item, Gold)
+                                       or item in still_held
+                                       for item in rejected):
+                self._close(offer_id)
+        return rejected
+
+
+if __name__ == '__main__':
+    def main():
+        from concurrent.futures import ThreadPoolExecutor
+        import random
+        import time
+
+        from items import Weapon
+
+        traders_count, trades, workers = 200, 50_000, 16
+        traders = [Inventory(20) for _ in range(traders_count)]
+        for number, trader in enumerate(traders):
+            trader.store(Gold(1000),
+                         *[Weapon(f"Blade {number}-{i}", "Sharp.", 10, 5)
+                           for i in range(5)])
+        post, stash = TradingPost(), Stash(slots=traders_count * 20)
+
+        def total():
+            items_count = sum(len(trader) for trader in traders)
+            return (sum(trader.gold for trader in traders),
+                    items_count + len(stash.inventory))
+
+        def work(seed):
+            rng = random.Random(seed)
+            done = 0
+            for _ in range(trades // workers):
+                trader = rng.choice(traders)
+                roll = rng.random()
+                held = trader.contents('Weapon')
+                if roll < 0.4 and held:
+                    post.offer(trader, [rng.choice(held)], rng.randint(1, 20))
+                elif roll < 0.8:
+                    open_offers = list(post.offers())
+                    if open_offers:
+                        post.accept(rng.choice(open_offers), trader)
+                elif roll < 0.9 and held:
+                    stash.deposit(trader, rng.choice(held))
+                else:
+                    stored = stash.inventory.contents('Weapon')
+                    if stored:
+                        stash.withdraw(trader, rng.choice(stored))
+                done += 1
+            return done
+
+        before = total()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(workers) as pool:
+            done = sum(pool.map(work, range(workers)))
+        elapsed = time.perf_counter() - started
+        print(f"{done} operations by {workers} threads over "
+              f"{traders_count} traders: {done / elapsed:,.0f} ops/sec")
+        print(f"gold and items before {before}, after {total()}")
+
+    main()
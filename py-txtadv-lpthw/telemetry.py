@@ -0,0 +1,285 @@
+"""Records gameplay events to compressed columnar files and analyzes them"""
+
+from array import array
+from collections import Counter, defaultdict
+from itertools import compress
+import struct
+import sys
+import uuid
+import warnings
+import zlib
+
+MOVE = 1
+DAMAGE_TAKEN = 2
+ATTACK = 3
+FLEE = 4
+LOOT = 5
+DEATH = 6
+VICTORY = 7
+
+EVENT_NAMES = {
+    MOVE: 'move',
+    DAMAGE_TAKEN: 'damage_taken',
+    ATTACK: 'attack',
+    FLEE: 'flee',
+    LOOT: 'loot',
+    DEATH: 'death',
+    VICTORY: 'victory',
+}
+
+
+def _typecode(size, signed):
+    """Return the array typecode whose items are exactly size bytes."""
+    for typecode in ('bhilq' if signed else 'BHILQ'):
+        if array(typecode).itemsize == size:
+            return typecode
+    raise ValueError(f"no {size}-byte array typecode on this platform")
+
+
+# (column name, array typecode); each batch stores the columns in this order.
+# Typecodes are picked by item size so the file is the same on every platform.
+COLUMNS = tuple(
+    (name, _typecode(size, signed)) for name, size, signed in (
+        ('sessions', 8, False),
+        ('kinds', 1, False),
+        ('xs', 2, True),
+        ('ys', 2, True),
+        ('values', 4, True),
+    ))
+
+_MAGIC = b'TXTL'
+_VERSION = 2
+_BATCH_HEADER = struct.Struct('<4sBI')
+_COLUMN_HEADER = struct.Struct('<I')
+_SWAP_BYTES = sys.byteorder == 'big'
+
+
+def new_session_id():
+    """Return a random 64-bit session id."""
+    return uuid.uuid4().int >> 64
+
+
+class TelemetryWriter(object):
+
+    """
+    Buffers events column by column and appends them to a file in
+    zlib-compressed batches. Recording an event is a handful of
+    array appends; nothing touches the disk until a batch fills up.
+
+    """
+
+    def __init__(self, path, session=None, batch_size=4096, level=6):
+        """
+        :param str path: File the batches are appended to.
+        :param int session: 64-bit id written alongside every event,
+            random if not given.
+        :param int batch_size: Events buffered before a flush.
+        :param int level: zlib compression level.
+
+        """
+        self.path = path
+        self.session = new_session_id() if session is None else session
+        self.batch_size = batch_size
+        self.level = level
+        self._columns = [array(typecode) for _, typecode in COLUMNS]
+        self._file = open(path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pending(self):
+        """Return the number of buffered events not yet written."""
+        return len(self._columns[0])
+
+    def record(self, kind, x, y, value=0, session=None):
+        """Buffer a single event, flushing when the batch is full."""
+        sessions, kinds, xs, ys, values = self._columns
+        sessions.append(self.session if session is None else session)
+        kinds.append(kind)
+        xs.append(x)
+        ys.append(y)
+        values.append(value)
+        if len(kinds) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Compress and write the buffered events as one batch."""
+        count = self.pending()
+        if not count:
+            return
+        chunks = [_BATCH_HEADER.pack(_MAGIC, _VERSION, count)]
+        for column in self._columns:
+            if _SWAP_BYTES:
+                column.byteswap()
+            data = zlib.compress(column.tobytes(), self.level)
+            chunks.append(_COLUMN_HEADER.pack(len(data)))
+            chunks.append(data)
+        self._file.write(b''.join(chunks))
+        self._file.flush()
+        self._columns = [array(typecode) for _, typecode in COLUMNS]
+
+    def close(self):
+        """Flush any buffered events and close the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+class SessionRecorder(object):
+
+    """
+    Records one session's events into a TelemetryWriter shared with
+    other sessions. Closing it leaves the writer open; whoever created
+    the writer closes it.
+
+    """
+
+    def __init__(self, writer, session=None):
+        self.writer = writer
+        self.session = new_session_id() if session is None else session
+
+    def record(self, kind, x, y, value=0):
+        self.writer.record(kind, x, y, value, self.session)
+
+    def close(self):
+        pass
+
+
+class TelemetryLog(object):
+
+    """
+    Every event from one or more telemetry files, held as columns.
+
+    A file that ends part way through a batch (its writer was killed
+    mid-append) keeps its complete batches; the cut-off tail is skipped
+    with a warning and listed in truncated as (path, byte offset).
+
+    """
+
+    def __init__(self):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.truncated = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def load(self, path):
+        """Append every complete batch in a telemetry file to the columns."""
+        with open(path, 'rb') as log_file:
+            data = log_file.read()
+        offset = 0
+        while offset < len(data):
+            batch_start = offset
+            try:
+                batch, offset = self._read_batch(path, data, offset)
+            except _Truncated:
+                self.truncated.append((path, batch_start))
+                warnings.warn(f"{path}: skipped truncated batch at byte "
+                              f"{batch_start}")
+                break
+            for (name, _), column in zip(COLUMNS, batch):
+                getattr(self, name).extend(column)
+        return self
+
+    def _read_batch(self, path, data, offset):
+        """Return the columns of the batch at offset and the next offset."""
+        if offset + _BATCH_HEADER.size > len(data):
+            raise _Truncated()
+        magic, version, count = _BATCH_HEADER.unpack_from(data, offset)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a telemetry file "
+                             f"(bad batch at byte {offset})")
+        offset += _BATCH_HEADER.size
+        batch = []
+        for name, typecode in COLUMNS:
+            if offset + _COLUMN_HEADER.size > len(data):
+                raise _Truncated()
+            size, = _COLUMN_HEADER.unpack_from(data, offset)
+            offset += _COLUMN_HEADER.size
+            if offset + size > len(data):
+                raise _Truncated()
+            column = array(typecode)
+            try:
+                column.frombytes(zlib.decompress(data[offset:offset + size]))
+            except (zlib.error, ValueError) as error:
+                raise ValueError(f"{path}: corrupt {name} column at byte "
+                                 f"{offset}") from error
+            if _SWAP_BYTES:
+                column.byteswap()
+            if len(column) != count:
+                raise ValueError(f"{path}: {name} column at byte {offset} "
+                                 f"holds {len(column)} of {count} events")
+            batch.append(column)
+            offset += size
+        return batch, offset
+
+    def heatmap(self, kind):
+        """Return a Counter of {(x, y): events} for one event kind."""
+        # Map the wanted kind to 1 and every other byte to 0 so the
+        # filtering stays in C rather than a Python-level comparison
+        table = bytes(int(i == kind) for i in range(256))
+        selectors = self.kinds.tobytes().translate(table)
+        return Counter(compress(zip(self.xs, self.ys), selectors))
+
+    def funnel(self, *steps):
+        """
+        Return how many sessions reached each step, in order.
+
+        A session reaches step n once its events contain steps[0]
+        through steps[n] as a subsequence, e.g.
+        funnel(ATTACK, DAMAGE_TAKEN, VICTORY).
+
+        """
+        reached = defaultdict(int)
+        last = len(steps)
+        for session, kind in zip(self.sessions, self.kinds):
+            stage = reached[session]
+            if stage < last and kind == steps[stage]:
+                reached[session] = stage + 1
+        counts = [0] * last
+        for stage in reached.values():
+            for i in range(stage):
+                counts[i] += 1
+        return counts
+
+
+class _Truncated(Exception):
+    """Raised when a telemetry file ends part way through a batch."""
+
+
+def load(*paths):
+    """Return a TelemetryLog holding the events from every path."""
+    log = TelemetryLog()
+    for path in paths:
+        log.load(path)
+    return log
+
+
+def render_heatmap(heat):
+    """Return a heatmap as rows of tab-separated counts."""
+    if not heat:
+        return ''
+    x_max = max(x for x, _ in heat)
+    y_max = max(y for _, y in heat)
+    return '\n'.join(
+        '\t'.join(str(heat.get((x, y), '')) for x in range(x_max + 1))
+        for y in range(y_max + 1)
+        )
+
+
+if __name__ == '__main__':
+    def main():
+        log = load(*sys.argv[1:])
+        print(f"{len(log)} events from {len(set(log.sessions))} sessions")
+        for kind in (DEATH, FLEE, DAMAGE_TAKEN):
+            print(f"\n### {EVENT_NAMES[kind]}\n")
+            print(render_heatmap(log.heatmap(kind)))
+        print("\n### attack -> damage_taken -> victory\n")
+        print(log.funnel(ATTACK, DAMAGE_TAKEN, VICTORY))
+
+    main()
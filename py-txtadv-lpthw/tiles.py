@@ -3,6 +3,7 @@
 import actions
 import enemies
 import items
+import telemetry
 import world
 
 
@@ -25,6 +26,10 @@ def modify_player(self, the_player):
         """Process actions that change the state of the player."""
         raise NotImplementedError()
 
+    def symbol(self):
+        """The character that stands for this tile on the minimap."""
+        return '.'
+
     def adjacent_moves(self):
         """Returns all move actions for adjacent tiles."""
         moves = []
@@ -42,11 +47,15 @@ def available_actions(self):
         """Returns all of the available actions in this room."""
         moves = self.adjacent_moves()
         moves.append(actions.ViewInventory())
+        moves.append(actions.ViewMap())
 
         return moves
 
 
 class StartingRoom(MapTile):
+    def symbol(self):
+        return '+'
+
     def intro_text(self):
         return """
         You find yourself in a cave with a flickering torch on the wall.
@@ -73,10 +82,18 @@ class LootRoom(MapTile):
     """A room that adds something to the player's inventory"""
     def __init__(self, x, y, item):
         self.item = item
+        self.looted = False
         super().__init__(x, y)
 
+    def symbol(self):
+        return '.' if self.looted else '$'
+
     def add_loot(self, the_player):
-        the_player.inventory.store(self.item)
+        if self.looted or the_player.inventory.store(self.item):
+            return
+        self.looted = True
+        the_player.record(telemetry.LOOT, self.item.value)
+        world.tile_changed(self.x, self.y)
 
     def modify_player(self, the_player):
         self.add_loot(the_player)
@@ -87,10 +104,15 @@ def __init__(self, x, y):
         super().__init__(x, y, items.Weapon("Dagger", "A small pointed blade.", 10, 10))
 
     def intro_text(self):
-        return """
-        You notice something shiny in the corner.
-        It's a dagger! You pick it up.
-        """
+        if not self.looted:
+            return """
+            You notice something shiny in the corner.
+            It's a dagger! You pick it up.
+            """
+        else:
+            return """
+            An empty corner where you found a dagger.
+            """
 
 
 class Find5GoldRoom(LootRoom):
@@ -98,9 +120,14 @@ def __init__(self, x, y):
         super().__init__(x, y, items.Gold(5))
 
     def intro_text(self):
-        return """
-        Someone dropped a 5 gold piece. You pick it up.
-        """
+        if not self.looted:
+            return """
+            Someone dropped a 5 gold piece. You pick it up.
+            """
+        else:
+            return """
+            Another unremarkable part of the cave. You must forge onwards.
+            """
 
 
 class EnemyRoom(MapTile):
@@ -108,9 +135,13 @@ def __init__(self, x, y, enemy):
         self.enemy = enemy
         super().__init__(x, y)
 
+    def symbol(self):
+        return 'E' if self.enemy.is_alive() else 'x'
+
     def modify_player(self, the_player):
         if self.enemy.is_alive():
             the_player.health = the_player.health - self.enemy.damage
+            the_player.record(telemetry.DAMAGE_TAKEN, self.enemy.damage)
             print("\t{} deals {} damage to you. {} health remaining.".format(
                 self.enemy.name, self.enemy.damage, the_player.health
                 )
@@ -154,6 +185,9 @@ def intro_text(self):
 
 
 class SnakePitRoom(MapTile):
+    def symbol(self):
+        return '~'
+
     def intro_text(self):
         return """
         You have fallen into a pit of deadly snakes!
@@ -166,6 +200,9 @@ def modify_player(self, player):
 
 
 class LeaveCaveRoom(MapTile):
+    def symbol(self):
+        return '>'
+
     def intro_text(self):
         return """
         You see a bright light in the distance...
@@ -3,7 +3,9 @@
 import os
 
 _world = {}
+_versions = {}
 starting_position = (0, 0)
+map_size = (0, 0)
 
 
 def tile_exists(x, y):
@@ -23,6 +25,8 @@ def load_tiles():
     with open(f'{script_path}/../resources/map.txt', 'r') as map_file:
         rows = map_file.readlines()
     x_max = len(rows[0].split('\t'))
+    global map_size
+    map_size = (x_max, len(rows))
     for y in range(len(rows)):
         cols = rows[y].split('\t')
         for x in range(x_max):
@@ -31,3 +35,15 @@ def load_tiles():
                 global starting_position
                 starting_position = (x, y)
             _world[(x, y)] = None if tile_name == '' else getattr(__import__('tiles'), tile_name)(x, y)
+            # Caches keyed on tile_version() must not outlive the old tile
+            tile_changed(x, y)
+
+
+def tile_version(x, y):
+    """Returns how many times the tile at (x, y) has changed state."""
+    return _versions.get((x, y), 0)
+
+
+def tile_changed(x, y):
+    """Records that the tile at (x, y) changed state."""
+    _versions[(x, y)] = _versions.get((x, y), 0) + 1
@@ -12,3 +12,39 @@ def teardown():
 
 def test_basic():
     print("I RAN!", end='')
+
+
+def test_store_reports_rejected():
+    dagger = items.Weapon("Dagger", "A small pointed blade.", 10, 10)
+    rock = items.Weapon("Rock", "A fist-sized stone.", 0, 5)
+    pack = items.Inventory(1)
+    assert pack.store(items.Gold(3), dagger, rock) == [rock]
+    assert pack.gold == 3
+    assert pack.drop(rock) == [rock]
+
+
+def test_transfer_all_or_nothing():
+    dagger = items.Weapon("Dagger", "A small pointed blade.", 10, 10)
+    rock = items.Weapon("Rock", "A fist-sized stone.", 0, 5)
+    seller, buyer = items.Inventory(2), items.Inventory(2)
+    seller.store(dagger, rock)
+    buyer.store(items.Gold(5))
+
+    short = items.Gold(6)
+    assert items.transfer_batch([(seller, buyer, [dagger]),
+                                 (buyer, seller, [short])]) == [short]
+    assert seller.contents() == [dagger, rock]
+    assert buyer.gold == 5
+
+    assert items.transfer_batch([(seller, buyer, [dagger]),
+                                 (buyer, seller, [items.Gold(5)])]) == []
+    assert seller.contents() == [rock]
+    assert buyer.contents() == [dagger]
+    assert (seller.gold, buyer.gold) == (5, 0)
+
+
+def test_transfer_needs_space():
+    dagger = items.Weapon("Dagger", "A small pointed blade.", 10, 10)
+    source, destination = items.Inventory(1, dagger), items.Inventory(0)
+    assert items.transfer(source, destination, dagger) == [dagger]
+    assert len(source) == 1 and len(destination) == 0
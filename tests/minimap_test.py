@@ -0,0 +1,107 @@
+from minimap import ExploredTiles, Minimap
+from player import Player
+import world
+
+
+def _cell(minimap, x, y):
+    rows = minimap.render().split('\n')
+    ox, oy = minimap.origin
+    return rows[y - oy][x - ox]
+
+
+def test_explored_tiles():
+    explored = ExploredTiles(3, 2)
+    assert explored.mark(2, 1)
+    assert not explored.mark(2, 1)
+    assert not explored.mark(3, 0)
+    assert (2, 1) in explored
+    assert (0, 0) not in explored
+    assert (-1, 0) not in explored
+
+
+def test_render_explored_only():
+    world.load_tiles()
+    player = Player()
+    minimap = Minimap(player, width=5, height=5)
+    start_x, start_y = player.location_x, player.location_y
+    assert _cell(minimap, start_x, start_y) == '@'
+    player.move_north()
+    assert _cell(minimap, start_x, start_y - 1) == '@'
+    assert _cell(minimap, start_x, start_y) == '+'
+    assert _cell(minimap, start_x, start_y - 2) == ' '
+
+
+def test_render_after_several_moves():
+    world.load_tiles()
+    player = Player()
+    minimap = Minimap(player, width=5, height=5)
+    minimap.render()
+    player.move_west()
+    player.move_west()
+    y = player.location_y
+    assert [_cell(minimap, x, y) for x in range(3)] == ['@', '.', '+']
+
+
+def test_default_viewport_fits_small_map():
+    world.load_tiles()
+    player = Player()
+    assert (player.minimap.width, player.minimap.height) == world.map_size
+    start_x, start_y = player.location_x, player.location_y
+    player.move_south()
+    assert _cell(player.minimap, start_x, start_y) == '+'
+    assert player.minimap.origin == (0, 0)
+
+
+def test_scrolls_before_the_edge():
+    world.load_tiles()
+    player = Player()
+    minimap = Minimap(player, width=3, height=3)
+    start_x, start_y = player.location_x, player.location_y
+    minimap.render()
+    player.move_south()
+    assert _cell(minimap, start_x, start_y) == '+'
+    assert _cell(minimap, start_x, start_y + 1) == '@'
+
+
+def test_tile_change_redraws_cell():
+    world.load_tiles()
+    player = Player()
+    minimap = Minimap(player, width=5, height=9)
+    loot_x, loot_y = player.location_x, player.location_y + 1
+    player.move_south()
+    player.move_north()
+    assert _cell(minimap, loot_x, loot_y) == '$'
+    world.tile_exists(loot_x, loot_y).add_loot(player)
+    assert _cell(minimap, loot_x, loot_y) == '.'
+
+
+def test_reload_redraws_cells():
+    world.load_tiles()
+    player = Player()
+    minimap = Minimap(player, width=5, height=9)
+    loot_x, loot_y = player.location_x, player.location_y + 1
+    player.move_south()
+    player.move_north()
+    world.tile_exists(loot_x, loot_y).add_loot(player)
+    assert _cell(minimap, loot_x, loot_y) == '.'
+    world.load_tiles()
+    assert _cell(minimap, loot_x, loot_y) == '$'
+
+
+def test_full_inventory_leaves_loot():
+    world.load_tiles()
+    player = Player()
+    player.inventory.shrink(player.inventory.capacity)
+    room = world.tile_exists(player.location_x + 2, player.location_y)
+    room.add_loot(player)
+    assert not room.looted
+    assert room.symbol() == '$'
+    assert 'You pick it up' in room.intro_text()
+
+
+def test_looted_room_intro():
+    world.load_tiles()
+    player = Player()
+    room = world.tile_exists(player.location_x + 2, player.location_y)
+    room.add_loot(player)
+    assert 'You pick it up' not in room.intro_text()
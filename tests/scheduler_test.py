@@ -0,0 +1,169 @@
+import logging
+import os
+import tempfile
+
+from items import Weapon
+from player import Player
+from scheduler import Session, TickScheduler
+import telemetry
+import world
+
+
+def _session(written):
+    player = Player(Weapon("Dagger", "A small pointed blade.", 10, 10))
+    return Session(player, written.append)
+
+
+def test_one_write_per_tick():
+    world.load_tiles()
+    scheduler = TickScheduler()
+    written = []
+    session = _session(written)
+    scheduler.join(session)
+    assert len(written) == 1
+    session.submit('n')
+    session.submit('x')
+    assert scheduler.tick() == 1
+    assert len(written) == 2
+    assert session.player.location_y == world.starting_position[1] - 1
+    assert scheduler.tick() == 1
+    assert 'x is not a valid action!' in written[2]
+    assert scheduler.tick() == 0
+
+
+def test_backpressure():
+    world.load_tiles()
+    session = _session([])
+    session.max_pending = 2
+    assert session.submit('n')
+    assert session.submit('n')
+    assert not session.submit('n')
+
+
+def test_attacks_on_one_enemy_resolve_together():
+    world.load_tiles()
+    scheduler = TickScheduler()
+    first, second = [], []
+    sessions = [_session(first), _session(second)]
+    for session in sessions:
+        scheduler.join(session)
+        session.submit('w')
+        session.submit('w')
+        session.submit('a')
+    scheduler.tick()
+    scheduler.tick()
+    assert scheduler.tick() == 2
+    assert 'You killed Giant Spider!' in first[-1]
+    assert 'Giant Spider is already dead.' in second[-1]
+
+
+def test_overrun_halves_budget():
+    world.load_tiles()
+    now = [0.0]
+
+    def clock():
+        now[0] += 1
+        return now[0]
+
+    scheduler = TickScheduler(tick_rate=10, max_commands_per_tick=8,
+                              clock=clock, sleep=lambda seconds: None)
+    session = _session([])
+    scheduler.join(session)
+    session.submit('i')
+    assert scheduler.run(ticks=2) == 1
+    assert scheduler.overruns == 2
+    assert scheduler.budget == 2
+
+
+def test_one_session_error_spares_the_tick():
+    world.load_tiles()
+    scheduler = TickScheduler()
+    unarmed, armed = [], []
+    sessions = [Session(Player(), unarmed.append), _session(armed)]
+    for session in sessions:
+        scheduler.join(session)
+        session.submit('w')
+        session.submit('w')
+        session.submit('a')
+    scheduler.tick()
+    scheduler.tick()
+    assert scheduler.tick() == 2
+    assert 'Something went wrong' in unarmed[-1]
+    assert 'You killed Giant Spider!' in armed[-1]
+    assert not sessions[0].finished
+
+
+def test_leave_closes_player():
+    world.load_tiles()
+    scheduler = TickScheduler()
+    session = _session([])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        session.player.telemetry = telemetry.TelemetryWriter(path)
+        scheduler.join(session)
+        session.submit('n')
+        scheduler.tick()
+        session.submit('s')
+        scheduler.leave(session)
+        assert len(telemetry.load(path)) == 1
+    assert session.finished
+    assert not session.pending
+    assert not scheduler.sessions
+    assert scheduler.tick() == 0
+
+
+def test_scheduler_records_telemetry():
+    world.load_tiles()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        scheduler = TickScheduler(telemetry_path=path)
+        sessions = [_session([]), _session([])]
+        for session in sessions:
+            scheduler.join(session)
+            session.submit('n')
+        scheduler.tick()
+        scheduler.close()
+        log = telemetry.load(path)
+    assert len(set(log.sessions)) == 2
+    assert sum(log.heatmap(telemetry.MOVE).values()) == 2
+
+
+def test_failing_write_drops_only_that_session():
+    world.load_tiles()
+    scheduler = TickScheduler()
+
+    def broken_pipe(text):
+        raise BrokenPipeError()
+
+    written = []
+    broken = Session(Player(), lambda text: None)
+    scheduler.join(broken)
+    broken.write = broken_pipe
+    working = _session(written)
+    scheduler.join(working)
+    for session in (broken, working):
+        session.submit('n')
+    assert scheduler.tick() == 2
+    assert len(written) == 2
+    assert broken.finished and not broken.output.getvalue()
+    assert list(scheduler.sessions) == [working]
+
+
+def test_session_errors_are_logged():
+    world.load_tiles()
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('scheduler')
+    logger.addHandler(handler)
+    try:
+        scheduler = TickScheduler()
+        session = Session(Player(), lambda text: None)
+        scheduler.join(session)
+        for command in 'wwa':
+            session.submit(command)
+            scheduler.tick()
+    finally:
+        logger.removeHandler(handler)
+    assert len(records) == 1
+    assert records[0].exc_info[0] is AttributeError
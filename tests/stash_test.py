@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from items import Gold, Inventory, Weapon
+from stash import Stash, TradingPost
+
+
+def test_deposit_and_withdraw():
+    dagger = Weapon("Dagger", "A small pointed blade.", 10, 10)
+    pack, stash = Inventory(1, dagger), Stash(slots=1)
+    assert stash.deposit(pack, dagger) == []
+    assert stash.inventory.contents() == [dagger]
+    assert stash.withdraw(pack, dagger) == []
+    assert pack.contents() == [dagger]
+
+
+def test_trade():
+    dagger = Weapon("Dagger", "A small pointed blade.", 10, 10)
+    seller, buyer = Inventory(2, dagger), Inventory(2, Gold(3))
+    post = TradingPost()
+    offer_id = post.offer(seller, [dagger], 5)
+    assert post.accept(offer_id, buyer) == [Gold(5)]
+    assert offer_id in post.offers()
+    buyer.store(Gold(2))
+    assert post.accept(offer_id, buyer) == []
+    assert buyer.contents() == [dagger]
+    assert (seller.gold, buyer.gold) == (5, 0)
+    assert post.accept(offer_id, buyer) is None
+
+
+def test_concurrent_trades_keep_totals():
+    traders = [Inventory(10, Gold(100)) for _ in range(8)]
+    for number, trader in enumerate(traders):
+        trader.store(*[Weapon(f"Blade {number}-{i}", "Sharp.", 1, 1)
+                       for i in range(3)])
+    post = TradingPost()
+
+    def trade(number):
+        seller = traders[number % len(traders)]
+        buyer = traders[(number + 1) % len(traders)]
+        held = seller.contents('Weapon')
+        if held:
+            post.accept(post.offer(seller, held[:1], 1), buyer)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(trade, range(400)))
+    assert sum(trader.gold for trader in traders) == 800
+    assert sum(len(trader) for trader in traders) == 24
+
+
+def test_cancel_waits_for_accept():
+    dagger = Weapon("Dagger", "A small pointed blade.", 10, 10)
+    seller, buyer = Inventory(2, dagger), Inventory(2, Gold(3))
+    post = TradingPost()
+    offer_id = post.offer(seller, [dagger], 5)
+    results = {}
+
+    def accept():
+        results['accept'] = post.accept(offer_id, buyer)
+
+    def cancel():
+        results['cancel'] = post.cancel(offer_id, seller)
+
+    # Hold the buyer's lock so accept() stalls inside the transfer
+    with buyer._lock:
+        accepting = threading.Thread(target=accept)
+        accepting.start()
+        while not post._offers[offer_id][3].locked():
+            time.sleep(0.001)
+        assert offer_id in post.offers()
+        cancelling = threading.Thread(target=cancel)
+        cancelling.start()
+        time.sleep(0.01)
+        assert 'cancel' not in results
+    accepting.join()
+    cancelling.join()
+    assert results == {'accept': [Gold(5)], 'cancel': True}
+    assert offer_id not in post.offers()
+    assert post.accept(offer_id, buyer) is None
+
+
+def test_offer_checks_price_and_items():
+    dagger = Weapon("Dagger", "A small pointed blade.", 10, 10)
+    rock = Weapon("Rock", "A fist-sized stone.", 0, 5)
+    seller = Inventory(2, dagger, Gold(4))
+    post = TradingPost()
+    assert post.offer(seller, [dagger], -5) is None
+    assert post.offer(seller, [rock], 5) is None
+    assert post.offer(seller, [dagger, dagger], 5) is None
+    assert post.offer(seller, [Gold(5)], 1) is None
+    assert post.offer(seller, [dagger, Gold(4)], 0) is not None
+    assert len(post.offers()) == 1
+
+
+def test_only_the_seller_cancels():
+    dagger = Weapon("Dagger", "A small pointed blade.", 10, 10)
+    seller, other = Inventory(1, dagger), Inventory(1)
+    post = TradingPost()
+    offer_id = post.offer(seller, [dagger], 5)
+    assert not post.cancel(offer_id, other)
+    assert offer_id in post.offers()
+    assert post.cancel(offer_id, seller)
+    assert not post.cancel(offer_id, seller)
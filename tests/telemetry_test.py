@@ -0,0 +1,87 @@
+import os
+import tempfile
+import warnings
+
+import telemetry
+
+
+def _write_sessions(path):
+    with telemetry.TelemetryWriter(path, session=1, batch_size=2) as log:
+        log.record(telemetry.MOVE, 2, 3)
+        log.record(telemetry.ATTACK, 2, 3, 5)
+        log.record(telemetry.DAMAGE_TAKEN, 2, 3, 15)
+        log.record(telemetry.DEATH, 2, 3)
+    with telemetry.TelemetryWriter(path, session=2) as log:
+        log.record(telemetry.MOVE, 2, 3)
+        log.record(telemetry.ATTACK, 2, 3, 5)
+        log.record(telemetry.VICTORY, 3, 0)
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        _write_sessions(path)
+        log = telemetry.load(path)
+    assert len(log) == 7
+    assert list(log.sessions) == [1, 1, 1, 1, 2, 2, 2]
+    assert list(log.values) == [0, 5, 15, 0, 0, 5, 0]
+
+
+def test_heatmap():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        _write_sessions(path)
+        log = telemetry.load(path)
+    assert log.heatmap(telemetry.MOVE) == {(2, 3): 2}
+    assert log.heatmap(telemetry.VICTORY) == {(3, 0): 1}
+    assert log.heatmap(telemetry.FLEE) == {}
+
+
+def test_funnel():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        _write_sessions(path)
+        log = telemetry.load(path)
+    funnel = log.funnel(telemetry.MOVE, telemetry.ATTACK, telemetry.VICTORY)
+    assert funnel == [2, 2, 1]
+
+
+def test_random_sessions_are_64_bit():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        with telemetry.TelemetryWriter(path, session=2 ** 64 - 1) as log:
+            log.record(telemetry.MOVE, 0, 0)
+        with telemetry.TelemetryWriter(path) as log:
+            session = log.session
+            log.record(telemetry.MOVE, 0, 0)
+        assert list(telemetry.load(path).sessions) == [2 ** 64 - 1, session]
+
+
+def test_truncated_tail_keeps_complete_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        _write_sessions(path)
+        with open(path, 'rb') as log_file:
+            data = log_file.read()
+        with open(path, 'wb') as log_file:
+            log_file.write(data[:-3])
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            log = telemetry.load(path)
+    assert list(log.sessions) == [1, 1, 1, 1]
+    assert len(log.truncated) == 1
+
+
+def test_sessions_share_a_writer():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        with telemetry.TelemetryWriter(path) as writer:
+            first = telemetry.SessionRecorder(writer, session=7)
+            second = telemetry.SessionRecorder(writer, session=8)
+            first.record(telemetry.MOVE, 1, 1)
+            second.record(telemetry.DEATH, 2, 2)
+            first.close()
+            second.record(telemetry.MOVE, 3, 3)
+        log = telemetry.load(path)
+    assert list(log.sessions) == [7, 8, 8]
+    assert log.heatmap(telemetry.DEATH) == {(2, 2): 1}